@@ -1,5 +1,6 @@
 import os 
 
+from importlib.util import find_spec
 from pathlib import Path
 # Configuracion de la ruta base del proyecto
 #Esto es necesario para que Django pueda encontrar los archivos 
@@ -71,10 +72,34 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Reutiliza la conexión entre peticiones (segundos) en lugar de abrir una por petición;
+        # CONN_HEALTH_CHECKS descarta conexiones caídas antes de usarlas
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
 
+# Caché compartida por todos los procesos (workers del servidor y comandos de manage.py):
+# el conteo del listado, el ETag y los intentos de login deben verse igual en todos.
+# Con REDIS_URL y el paquete redis se usa Redis; si no, una tabla de la base de datos,
+# que se crea con `python manage.py createcachetable`.
+if os.environ.get('REDIS_URL') and find_spec('redis') is not None:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'cache_compartida',
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -93,6 +118,19 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Hashers de contraseñas. El primero se usa para los hashes nuevos; el resto
+# solo verifica hashes existentes y los actualiza en el siguiente login.
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+# Argon2 pasa a ser el hasher por defecto cuando argon2-cffi está instalado
+if find_spec('argon2') is not None:
+    PASSWORD_HASHERS.insert(0, 'usuarios.hashers.Argon2AjustadoPasswordHasher')
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -118,3 +156,13 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Configuración del modelo de usuario personalizado
 AUTH_USER_MODEL = 'usuarios.Usuario'
+
+# Backend de autenticación que solo carga las columnas necesarias del usuario
+AUTHENTICATION_BACKENDS = ['usuarios.backends.UsuarioModelBackend']
+
+# Página a la que @login_required redirige a los usuarios no autenticados
+LOGIN_URL = '/usuarios/'
+
+# Sesiones en una cookie firmada con SECRET_KEY: iniciar sesión no escribe en la base de datos.
+# La sesión no puede invalidarse en el servidor, así que solo debe guardar datos pequeños.
+SESSION_ENGINE = 'django.contrib.sessions.backends.signed_cookies'
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ProductosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'productos'
+
+    def ready(self):
+        # Registra los receptores que invalidan el conteo cacheado de productos
+        from . import signals
@@ -6,4 +6,22 @@ class ProductoForm(forms.ModelForm):
    class Meta: 
        model = Producto
        fields = ['nombre', 'descripcion', 'precio', 'cantidad_stock']
+
+
+   def save(self, commit=True):
+       producto = super().save(commit=False)
+       if commit:
+           if producto._state.adding:
+               producto.save()
+           elif self.changed_data:
+               # Al editar solo se actualizan las columnas modificadas (más la fecha auto_now);
+               # los campos many-to-many no son columnas y los guarda _save_m2m()
+               columnas = {campo.name for campo in producto._meta.concrete_fields}
+               producto.save(update_fields=[
+                   *(campo for campo in self.changed_data if campo in columnas),
+                   'fecha_ultima_modificacion',
+               ])
+           # Igual que ModelForm.save(commit=True): guarda también las relaciones many-to-many
+           self._save_m2m()
+       return producto
        
\ No newline at end of file
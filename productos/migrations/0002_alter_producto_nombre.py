@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+def eliminar_duplicados(apps, schema_editor):
+    # Conserva el producto más antiguo de cada nombre antes de crear el índice único
+    Producto = apps.get_model('productos', 'Producto')
+    vistos = set()
+    duplicados = []
+    for pk, nombre in Producto.objects.order_by('pk').values_list('pk', 'nombre').iterator():
+        if nombre in vistos:
+            duplicados.append(pk)
+        else:
+            vistos.add(nombre)
+    if duplicados:
+        Producto.objects.filter(pk__in=duplicados).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('productos', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(eliminar_duplicados, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='producto',
+            name='nombre',
+            field=models.CharField(max_length=100, unique=True),
+        ),
+    ]
@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('productos', '0002_alter_producto_nombre'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='producto',
+            name='fecha_ultima_modificacion',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='producto',
+            index=models.Index(fields=['-fecha_ultima_modificacion'], name='prod_fecha_desc_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+
+# Segundos que se reutiliza el total de filas antes de volver a contar
+CONTEO_TTL = 60
+
+
+def clave_conteo(model):
+    """Clave de caché con el total de filas de la tabla del modelo."""
+    return f'cnt:{model._meta.db_table}'
+
+
+def conteo_cacheado(model):
+    """Total de filas de la tabla del modelo, reutilizado de la caché durante CONTEO_TTL segundos."""
+    return cache.get_or_set(clave_conteo(model), model._default_manager.count, CONTEO_TTL)
+
+
+def invalidar_conteo(model):
+    """Descarta el total cacheado para que el próximo listado vuelva a contar."""
+    cache.delete(clave_conteo(model))
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Paginator que guarda en caché el COUNT(*) de la tabla durante CONTEO_TTL segundos.
+
+    La clave depende solo de la tabla, por lo que únicamente debe usarse con
+    querysets sin filtros (todas las filas del modelo).
+    """
+
+    @cached_property
+    def count(self):
+        return conteo_cacheado(self.object_list.model)
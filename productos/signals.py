@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Producto
+from .paginators import invalidar_conteo
+
+
+@receiver(post_save, sender=Producto)
+def producto_guardado(sender, created, **kwargs):
+    # Editar un producto no cambia el total, solo crearlo
+    if created:
+        invalidar_conteo(sender)
+
+
+@receiver(post_delete, sender=Producto)
+def producto_eliminado(sender, **kwargs):
+    invalidar_conteo(sender)
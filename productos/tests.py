@@ -1,3 +1,107 @@
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management import call_command
 from django.test import TestCase
+from django.urls import reverse
+
+from .forms import ProductoForm
+from .models import Producto
+from .paginators import clave_conteo, conteo_cacheado
+
+
+class ListaProductosETagTests(TestCase):
+   """Tras crear, editar o borrar, la petición condicional al listado no debe responder 304."""
+
+   def setUp(self):
+       usuario = get_user_model().objects.create_user(
+           username='ana', email='ana@x.com', password='secret1',
+       )
+       self.client.force_login(usuario)
+       self.antiguo = Producto.objects.create(
+           nombre='Collar', descripcion='Collar', precio=Decimal('10.00'), cantidad_stock=5,
+       )
+       self.reciente = Producto.objects.create(
+           nombre='Correa', descripcion='Correa', precio=Decimal('20.00'), cantidad_stock=3,
+       )
+       self.url = reverse('productos:lista')
+
+   def _etag(self):
+       respuesta = self.client.get(self.url)
+       self.assertEqual(respuesta.status_code, 200)
+       return respuesta['ETag']
+
+   def _get_condicional(self, etag):
+       return self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+   def test_cache_compartida_entre_procesos(self):
+       # Con una caché por proceso, otros workers seguirían usando el conteo anterior
+       self.assertNotIsInstance(caches['default'], LocMemCache)
+
+   def test_sin_cambios_responde_304(self):
+       self.assertEqual(self._get_condicional(self._etag()).status_code, 304)
+
+   def test_crear(self):
+       etag = self._etag()
+       self.client.post(reverse('productos:nuevo'), {
+           'nombre': 'Cama', 'descripcion': 'Cama', 'precio': '30.00', 'cantidad_stock': 2,
+       })
+       respuesta = self._get_condicional(etag)
+       self.assertEqual(respuesta.status_code, 200)
+       self.assertContains(respuesta, 'Cama')
+
+   def test_editar(self):
+       etag = self._etag()
+       self.client.post(reverse('productos:editar', args=[self.antiguo.pk]), {
+           'nombre': 'Collar isabelino', 'descripcion': 'Collar', 'precio': '10.00', 'cantidad_stock': 5,
+       })
+       respuesta = self._get_condicional(etag)
+       self.assertEqual(respuesta.status_code, 200)
+       self.assertContains(respuesta, 'Collar isabelino')
+
+   def test_borrar_producto_que_no_es_el_mas_reciente(self):
+       # Borrarlo no cambia MAX(fecha_ultima_modificacion): solo el total distingue el ETag
+       etag = self._etag()
+       self.client.post(reverse('productos:eliminar', args=[self.antiguo.pk]))
+       respuesta = self._get_condicional(etag)
+       self.assertEqual(respuesta.status_code, 200)
+       self.assertNotContains(respuesta, 'Collar')
+
+
+class CargarProductosTests(TestCase):
+
+   def test_invalida_el_conteo_compartido(self):
+       self.assertEqual(conteo_cacheado(Producto), 0)
+       call_command('cargar_productos', stdout=StringIO())
+       self.assertIsNone(cache.get(clave_conteo(Producto)))
+       self.assertEqual(conteo_cacheado(Producto), Producto.objects.count())
+
+
+class ProductoFormTests(TestCase):
+
+   def setUp(self):
+       self.producto = Producto.objects.create(
+           nombre='Collar', descripcion='Collar', precio=Decimal('10.00'), cantidad_stock=5,
+       )
+       self.datos = {'nombre': 'Collar', 'descripcion': 'Collar', 'precio': '10.00', 'cantidad_stock': 5}
+
+   def test_editar_guarda_solo_lo_modificado_y_las_relaciones(self):
+       form = ProductoForm({**self.datos, 'cantidad_stock': 7}, instance=self.producto)
+       self.assertTrue(form.is_valid())
+       with mock.patch.object(form, '_save_m2m') as save_m2m:
+           form.save()
+       save_m2m.assert_called_once_with()
+       self.producto.refresh_from_db()
+       self.assertEqual(self.producto.cantidad_stock, 7)
 
-# Create your tests here.
+   def test_formulario_sin_cambios_no_escribe(self):
+       fecha = self.producto.fecha_ultima_modificacion
+       form = ProductoForm(self.datos, instance=self.producto)
+       self.assertTrue(form.is_valid())
+       form.save()
+       self.producto.refresh_from_db()
+       self.assertEqual(self.producto.fecha_ultima_modificacion, fecha)
@@ -1,15 +1,40 @@
+import hashlib
+
 from django.shortcuts import render, redirect, get_object_or_404
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from django.core.paginator import EmptyPage, PageNotAnInteger
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.db.models import Max
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import etag
 from .models import Producto
 from .forms import ProductoForm
+from .paginators import CachedCountPaginator, conteo_cacheado
+
+
+def etag_lista_productos(request):
+   """ETag del listado: cambia al crear, editar o borrar productos, y depende de la página y el usuario."""
+   # El total sale de la misma caché que usa el paginador; es compartida por todos los procesos
+   # (CACHES en settings), así que la invalidación de los receptores de signals llega a todos
+   ultima = Producto.objects.aggregate(ultima=Max('fecha_ultima_modificacion'))['ultima']
+   total = conteo_cacheado(Producto)
+   pagina = request.GET.get('page', 1)
+   clave = f"{request.user.pk}-{pagina}-{total}-{ultima}"
+   # Hash para que el valor sea un ETag válido aunque `page` traiga caracteres arbitrarios
+   return hashlib.md5(clave.encode(), usedforsecurity=False).hexdigest()
 
 
-@login_required(login_url='/usuarios/')
+@login_required
+# no-cache: el navegador revalida siempre (304 vía ETag), así tras crear, editar o
+# borrar y volver al listado nunca muestra una copia sin el cambio
+@cache_control(private=True, no_cache=True)
+@etag(etag_lista_productos)
 def lista_productos(request):
-   productos_list = Producto.objects.all().order_by('-fecha_ultima_modificacion')
-   paginator = Paginator(productos_list, 10)
+   # Solo las columnas que muestra el listado; `descripcion` puede ser un texto largo
+   productos_list = Producto.objects.only(
+       'id', 'nombre', 'precio', 'cantidad_stock', 'fecha_ultima_modificacion'
+   ).order_by('-fecha_ultima_modificacion')
+   paginator = CachedCountPaginator(productos_list, 10)
    page = request.GET.get('page', 1)
    try:
        productos = paginator.page(page)
@@ -18,7 +43,7 @@ def lista_productos(request):
    return render(request, 'productos/product_list.html', {'productos': productos})
 
 
-@login_required(login_url='/usuarios/')
+@login_required
 def create_product(request):
    form = ProductoForm(request.POST or None)
    if request.method == 'POST' and form.is_valid():
@@ -27,9 +52,12 @@ def create_product(request):
    return render(request, 'productos/product_form.html', {'form': form})
 
 
-@login_required(login_url='/usuarios/')
+@login_required
 def edit_product(request, pk):
-   prod = get_object_or_404(Producto, pk=pk)
+   # Solo los campos del formulario; la fecha se incluye para que auto_now se guarde
+   prod = get_object_or_404(
+       Producto.objects.only(*ProductoForm.Meta.fields, 'fecha_ultima_modificacion'), pk=pk
+   )
    form = ProductoForm(request.POST or None, instance=prod)
    if request.method == 'POST' and form.is_valid():
        form.save()
@@ -37,15 +65,16 @@ def edit_product(request, pk):
    return render(request, 'productos/product_form.html', {'form': form})
 
 
-@login_required(login_url='/usuarios/')
+@login_required
 def delete_product(request, pk):
-   prod = get_object_or_404(Producto, pk=pk)
+   # La confirmación solo muestra el nombre
+   prod = get_object_or_404(Producto.objects.only('id', 'nombre'), pk=pk)
    if request.method == 'POST':
        prod.delete()
        return redirect('productos:lista')
    return render(request, 'productos/product_confirm_delete.html', {'producto': prod})
 
-@login_required(login_url='/usuarios/')
+@login_required
 def inicio(request):
    """Vista para la página de inicio de productos - requiere autenticación."""
    context = {
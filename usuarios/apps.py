@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class UsuariosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'usuarios'
+
+    def ready(self):
+        from django.contrib.auth.signals import user_logged_in
+
+        # django.contrib.auth guarda last_login en cada login; se reemplaza por
+        # el receptor de usuarios.signals, que limita esa escritura
+        user_logged_in.disconnect(dispatch_uid='update_last_login')
+        from . import signals
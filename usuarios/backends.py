@@ -0,0 +1,40 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+# Columnas que usan la autenticación, la sesión, los permisos y las plantillas;
+# el resto (date_joined, last_name, fecha_registro) se carga solo si se accede a él
+CAMPOS_AUTENTICACION = (
+    'id', 'password', 'email', 'username', 'first_name',
+    'is_active', 'is_staff', 'is_superuser', 'last_login',
+)
+
+
+class UsuarioModelBackend(ModelBackend):
+    """ModelBackend que consulta solo CAMPOS_AUTENTICACION al autenticar y al cargar request.user."""
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = UserModel._default_manager.only(*CAMPOS_AUTENTICACION).get(
+                **{UserModel.USERNAME_FIELD: username}
+            )
+        except UserModel.DoesNotExist:
+            # Igual que ModelBackend: ejecutar el hasher para no revelar por tiempo
+            # de respuesta si el usuario existe
+            UserModel().set_password(password)
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
+
+    def get_user(self, user_id):
+        UserModel = get_user_model()
+        try:
+            user = UserModel._default_manager.only(*CAMPOS_AUTENTICACION).get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,14 @@
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class Argon2AjustadoPasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id con los parámetros mínimos recomendados por OWASP (19 MiB, 2 pasadas, 1 hilo),
+    del orden de 100 ms por hash frente a los 100 MiB y 8 hilos por defecto de Django.
+
+    Conserva el algoritmo 'argon2', así que los hashes existentes siguen verificándose y se
+    recalculan con estos parámetros en el siguiente login.
+    """
+    time_cost = 2
+    memory_cost = 19456
+    parallelism = 1
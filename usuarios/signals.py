@@ -0,0 +1,18 @@
+from datetime import timedelta
+
+from django.contrib.auth.signals import user_logged_in
+from django.dispatch import receiver
+from django.utils import timezone
+
+# Tiempo mínimo entre dos escrituras de last_login para el mismo usuario
+INTERVALO_ULTIMO_LOGIN = timedelta(minutes=5)
+
+
+@receiver(user_logged_in, dispatch_uid='actualizar_ultimo_login')
+def actualizar_ultimo_login(sender, user, **kwargs):
+    # Sustituye a update_last_login de Django: los logins repetidos dentro del
+    # intervalo no vuelven a escribir la fila del usuario
+    ahora = timezone.now()
+    if user.last_login is None or ahora - user.last_login >= INTERVALO_ULTIMO_LOGIN:
+        user.last_login = ahora
+        user.save(update_fields=['last_login'])
@@ -1,3 +1,146 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import IntegrityError
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from .views import MAX_INTENTOS_LOGIN, JSONDecodeError, _extraer_credenciales
+
+
+class ExtraerCredencialesTests(SimpleTestCase):
+    """El atajo de _extraer_credenciales debe dar lo mismo que decodificar el JSON completo."""
+
+    def test_objeto_plano(self):
+        self.assertEqual(
+            _extraer_credenciales(b'{"email":"ana@x.com","password":"secret1"}'),
+            ('ana@x.com', 'secret1'),
+        )
+
+    def test_orden_inverso_y_espacios(self):
+        self.assertEqual(
+            _extraer_credenciales(b' \n{ "password" : "secret1" ,\t"email": "ana@x.com" }\r\n'),
+            ('ana@x.com', 'secret1'),
+        )
+
+    def test_json_mal_formado(self):
+        cuerpos = [
+            b'{"email":"ana@x.com","password":"secret1" garbage}',
+            b'{"email":"ana@x.com","password":"secret1",}',
+            b'{"email":"ana@x.com" "password":"secret1"}',
+            b'{"email":"ana@x.com","password":"secret1"}}',
+            b'{"email":"ana@x.com","password":"sec\nret1"}',
+            b'{"email":"ana@x.com","password":"secret1"',
+            b'garbage{"email":"ana@x.com","password":"secret1"}',
+        ]
+        for cuerpo in cuerpos:
+            with self.subTest(cuerpo=cuerpo), self.assertRaises(JSONDecodeError):
+                _extraer_credenciales(cuerpo)
+
+    def test_escapes(self):
+        self.assertEqual(
+            _extraer_credenciales(b'{"email":"ana@x.com","password":"se\\"c\\\\r\\u00f1t\\n"}'),
+            ('ana@x.com', 'se"c\\rñt\n'),
+        )
+
+    def test_escape_invalido(self):
+        with self.assertRaises(JSONDecodeError):
+            _extraer_credenciales(b'{"email":"ana@x.com","password":"sec\\qret"}')
+
+    def test_valores_no_ascii(self):
+        self.assertEqual(
+            _extraer_credenciales('{"email":"peña@x.com","password":"contraseña€"}'.encode()),
+            ('peña@x.com', 'contraseña€'),
+        )
+
+    def test_claves_duplicadas(self):
+        # Como el parser JSON, gana la última aparición de cada clave
+        self.assertEqual(
+            _extraer_credenciales(b'{"email":"ana@x.com","email":"otro@x.com"}'),
+            ('otro@x.com', None),
+        )
+        self.assertEqual(
+            _extraer_credenciales(b'{"email":"ana@x.com","password":"a","password":"b"}'),
+            ('ana@x.com', 'b'),
+        )
+
+    def test_objetos_anidados(self):
+        self.assertEqual(
+            _extraer_credenciales(b'{"email":"ana@x.com","extra":{"password":"x"},"password":"secret1"}'),
+            ('ana@x.com', 'secret1'),
+        )
+        self.assertEqual(
+            _extraer_credenciales(b'{"datos":{"email":"ana@x.com","password":"secret1"}}'),
+            (None, None),
+        )
+
+
+class LoginUsuarioTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        get_user_model().objects.create_user(
+            username='ana', email='ana@x.com', password='secret1',
+        )
+
+    def _login(self, cuerpo):
+        return self.client.post(reverse('usuarios:api_login'), cuerpo, content_type='application/json')
+
+    def test_login_correcto(self):
+        respuesta = self._login(b'{"email":"ana@x.com","password":"secret1"}')
+        self.assertTrue(respuesta.json()['success'])
+
+    def test_json_mal_formado_no_inicia_sesion(self):
+        respuesta = self._login(b'{"email":"ana@x.com","password":"secret1" garbage}')
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta.json(), {
+            'success': False,
+            'message': 'Error en la autenticación: Formato de datos inválido',
+        })
+        self.assertNotIn('_auth_user_id', self.client.session)
+
+    def test_limite_de_intentos_fallidos(self):
+        for _ in range(MAX_INTENTOS_LOGIN):
+            respuesta = self._login(b'{"email":"ana@x.com","password":"incorrecta"}')
+            self.assertEqual(respuesta.status_code, 200)
+        # Aunque la contraseña sea correcta, no se ejecuta el hasher hasta que pase la ventana
+        respuesta = self._login(b'{"email":"ana@x.com","password":"secret1"}')
+        self.assertEqual(respuesta.status_code, 429)
+        self.assertNotIn('_auth_user_id', self.client.session)
+
+
+class RegisterViewTests(TestCase):
+
+    def setUp(self):
+        get_user_model().objects.create_user(
+            username='ana', email='ana@x.com', password='secret1',
+        )
+
+    def _registrar(self, email):
+        return self.client.post(reverse('usuarios:register'), {
+            'email': email, 'password1': 'secret1', 'password2': 'secret1',
+        })
+
+    def test_email_duplicado(self):
+        respuesta = self._registrar('ana@X.COM')
+        self.assertContains(respuesta, 'Este email ya está registrado')
+
+    def test_integrity_error_sin_email_duplicado(self):
+        with mock.patch('usuarios.views._crear_usuario', side_effect=IntegrityError) as crear:
+            respuesta = self._registrar('luis@x.com')
+        self.assertEqual(crear.call_count, 2)
+        self.assertContains(respuesta, 'No se pudo completar el registro, intenta de nuevo')
+        self.assertNotContains(respuesta, 'Este email ya está registrado')
+
+
+class RegistroUsuarioTests(TestCase):
+
+    def test_email_duplicado_con_dominio_en_mayusculas(self):
+        get_user_model().objects.create_user(
+            username='ana', email='ana@x.com', password='secret1',
+        )
+        respuesta = self.client.post(reverse('usuarios:api_registro'), {
+            'email': 'ana@X.COM', 'password': 'secret1', 'password_confirm': 'secret1',
+        }, content_type='application/json')
+        self.assertEqual(respuesta.json()['message'], 'Este email ya está registrado')
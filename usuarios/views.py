@@ -22,23 +22,241 @@
 # - Respuestas JSON para APIs REST
 # ========================================
 
-from django.shortcuts import render, redirect
+from django.shortcuts import redirect
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
+from django.contrib.auth.hashers import make_password
 from django.contrib import messages
-from django.http import JsonResponse
+from django.contrib.messages import constants as message_constants
+from django.contrib.messages.storage.base import Message
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.template.loader import get_template
+from django.views.decorators.cache import cache_control
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from django.views.decorators.vary import vary_on_headers
 from django.contrib.auth import get_user_model
-from django.contrib.auth.forms import UserCreationForm
-from django.contrib.auth.models import User
+from django.core.exceptions import RequestDataTooBig
+from django.db import IntegrityError, connection, transaction
+import hashlib
+import itertools
 import json
+import logging
+import re
+import secrets
+
+# Funciones JSON enlazadas una sola vez a nombres del módulo: orjson si está instalado,
+# si no el módulo json estándar (orjson.JSONDecodeError hereda de json.JSONDecodeError)
+try:
+    from orjson import JSONDecodeError, dumps as _dumps, loads as _loads
+except ImportError:  # orjson es opcional
+    from json import JSONDecodeError, loads as _loads
+
+    def _dumps(datos):
+        return json.dumps(datos).encode()
+
+logger = logging.getLogger(__name__)
 
 # Obtener el modelo de usuario personalizado configurado en settings.py
 Usuario = get_user_model()
 
+def _render_login(request, error=None):
+    """
+    Renderiza la página de login/registro. La plantilla se pide en cada llamada: el
+    loader con caché de Django la sirve ya compilada desde memoria, y runserver la
+    recarga cuando cambia el archivo.
+
+    `error` se muestra directamente en la página, sin guardarlo en el almacenamiento
+    de mensajes (cookie o sesión) como hace messages.error().
+    """
+    contexto = {}
+    if error is not None:
+        contexto['messages'] = [Message(message_constants.ERROR, error)]
+    return HttpResponse(get_template('usuarios/login.html').render(contexto, request))
+
+
+# Tamaño máximo (bytes) del cuerpo JSON que aceptan las APIs de registro y login
+MAX_CUERPO_JSON = 4096
+
+
+def _leer_cuerpo(request):
+    """
+    Lee el cuerpo directamente del stream de la petición, sin la copia de request.body.
+    Lanza RequestDataTooBig si supera MAX_CUERPO_JSON.
+    """
+    cuerpo = request.read(MAX_CUERPO_JSON + 1)
+    if len(cuerpo) > MAX_CUERPO_JSON:
+        raise RequestDataTooBig('El cuerpo de la petición supera el tamaño permitido')
+    return cuerpo
+
+
+def _respuesta_json(datos, status=200):
+    """Construye la respuesta JSON del servicio web."""
+    return _respuesta_cuerpo(_dumps(datos), status)
+
+
+def _respuesta_cuerpo(cuerpo, status=200):
+    """
+    Respuesta JSON a partir de un cuerpo ya serializado. Se crea un HttpResponse por
+    petición porque los middleware modifican sus cabeceras y cookies.
+    """
+    return HttpResponse(cuerpo, content_type='application/json', status=status)
+
+
+# Cuerpos de las respuestas fijas de login_usuario, serializados una sola vez al importar
+_LOGIN_OK = _dumps({
+    'success': True,
+    'message': 'Autenticación satisfactoria - Bienvenido a Huellitas Alegres',
+    'redirect_url': '/productos/',
+})
+_LOGIN_FALTAN_DATOS = _dumps({
+    'success': False,
+    'message': 'Email y contraseña son obligatorios',
+})
+_LOGIN_DEMASIADOS_INTENTOS = _dumps({
+    'success': False,
+    'message': 'Error en la autenticación: Demasiados intentos fallidos, intenta de nuevo en un minuto',
+})
+_LOGIN_CUENTA_DESACTIVADA = _dumps({
+    'success': False,
+    'message': 'Error en la autenticación: Cuenta desactivada',
+})
+_LOGIN_CREDENCIALES_INCORRECTAS = _dumps({
+    'success': False,
+    'message': 'Error en la autenticación: Email o contraseña incorrectos',
+})
+_LOGIN_FORMATO_INVALIDO = _dumps({
+    'success': False,
+    'message': 'Error en la autenticación: Formato de datos inválido',
+})
+
+
+# Cuerpo completo de la forma {"email": "...", "password": "..."} (en cualquier orden),
+# con solo espacios JSON entre los elementos y sin caracteres de control en las cadenas
+_ESPACIO_JSON = rb'[ \t\n\r]*'
+_PAR_CREDENCIAL = rb'"(email|password)"' + _ESPACIO_JSON + rb':' + _ESPACIO_JSON + rb'"((?:[^"\\\x00-\x1f]|\\.)*)"'
+_CREDENCIALES_PLANAS = re.compile(
+    _ESPACIO_JSON + rb'\{' + _ESPACIO_JSON + _PAR_CREDENCIAL + _ESPACIO_JSON + rb','
+    + _ESPACIO_JSON + _PAR_CREDENCIAL + _ESPACIO_JSON + rb'\}' + _ESPACIO_JSON
+)
+
+
+def _valor_json(crudo):
+    """Convierte el contenido crudo de una cadena JSON a str; solo se usa el parser si hay escapes o no-ASCII."""
+    if b'\\' in crudo or not crudo.isascii():
+        return _loads(b'"' + crudo + b'"')
+    return crudo.decode('ascii')
+
+
+def _extraer_credenciales(cuerpo):
+    """
+    Obtiene (email, password) del cuerpo JSON sin construir el diccionario completo.
+
+    El atajo solo se aplica cuando el cuerpo entero es un objeto JSON válido con
+    exactamente los campos email y password como cadenas; en cualquier otro caso
+    (otros campos, anidamiento, claves repetidas, JSON mal formado) se decodifica el
+    JSON completo, con los mismos resultados y errores que antes.
+    """
+    coincidencia = _CREDENCIALES_PLANAS.fullmatch(cuerpo)
+    if coincidencia is not None and coincidencia.group(1) != coincidencia.group(3):
+        campos = {
+            coincidencia.group(1): coincidencia.group(2),
+            coincidencia.group(3): coincidencia.group(4),
+        }
+        return _valor_json(campos[b'email']), _valor_json(campos[b'password'])
+    data = _loads(cuerpo)
+    return data.get('email'), data.get('password')
+
+
+# Intentos fallidos de login permitidos por IP y email dentro de la ventana (segundos)
+MAX_INTENTOS_LOGIN = 5
+VENTANA_INTENTOS_LOGIN = 60
+
+
+def _clave_intentos(request, email):
+    """Clave de caché del contador de intentos fallidos para la IP y el email."""
+    email_hash = hashlib.sha256(str(email).lower().encode()).hexdigest()
+    return f"lf:{request.META.get('REMOTE_ADDR', '')}:{email_hash}"
+
+
+def _registrar_intento_fallido(clave):
+    """
+    Incrementa el contador de intentos; la ventana empieza con el primer fallo.
+
+    El contador vive en la caché compartida (CACHES en settings), así que el límite es
+    global para todos los workers y no se reinicia al reiniciarlos. Con Redis, incr() es
+    un INCR atómico; con la caché en base de datos es lectura + escritura, y fallos
+    simultáneos de la misma IP y email pueden contarse como uno.
+    """
+    if not cache.add(clave, 1, VENTANA_INTENTOS_LOGIN):
+        try:
+            cache.incr(clave)
+        except ValueError:
+            # La clave expiró entre add() e incr()
+            cache.set(clave, 1, VENTANA_INTENTOS_LOGIN)
+
+
+def _crear_usuario(username, email, password_hash):
+    """
+    Equivale a Usuario.objects.create_user() con la contraseña ya hasheada, para que el
+    hasher se ejecute antes de abrir la transacción y no mientras se mantienen bloqueos.
+    """
+    usuario = Usuario(
+        username=Usuario.normalize_username(username),
+        email=Usuario.objects.normalize_email(email),
+        password=password_hash,
+    )
+    usuario.save()
+    return usuario
+
+
+def _bloquear_prefijo_username(prefijo):
+    """
+    En PostgreSQL toma un advisory lock de transacción sobre el prefijo de username, de modo
+    que solo un registro por prefijo busca sufijo e inserta a la vez. En otros motores no hace
+    nada: SQLite ya serializa las escrituras y la restricción UNIQUE cubre el resto.
+    """
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_xact_lock(hashtext(%s))', [prefijo])
+
+
+# Motivos de fallo que devuelve _autenticar
+DEMASIADOS_INTENTOS = 'demasiados_intentos'
+CUENTA_DESACTIVADA = 'cuenta_desactivada'
+CREDENCIALES_INCORRECTAS = 'credenciales_incorrectas'
+
+
+def _autenticar(request, email, password):
+    """
+    Flujo de login común a login_usuario (JSON) y login_view (formulario HTML):
+    limita los intentos fallidos, llama a authenticate() una sola vez e inicia la sesión.
+
+    Retorna (usuario, None) si el login es correcto, o (None, motivo) con motivo
+    DEMASIADOS_INTENTOS, CUENTA_DESACTIVADA o CREDENCIALES_INCORRECTAS.
+    """
+    # Cortar la fuerza bruta antes de consultar la base de datos y ejecutar el hasher
+    clave_intentos = _clave_intentos(request, email)
+    if cache.get(clave_intentos, 0) >= MAX_INTENTOS_LOGIN:
+        return None, DEMASIADOS_INTENTOS
+    
+    usuario = authenticate(request, username=email, password=password)
+    if usuario is None:
+        _registrar_intento_fallido(clave_intentos)
+        return None, CREDENCIALES_INCORRECTAS
+    if not usuario.is_active:
+        return None, CUENTA_DESACTIVADA
+    
+    cache.delete(clave_intentos)
+    login(request, usuario)
+    return usuario, None
+
 # ========================================
 # VISTA PRINCIPAL DEL SERVICIO WEB
 # ========================================
+@cache_control(private=True, max_age=3600)
+@vary_on_headers('Cookie')
 def auth_view(request):
     """
     SERVICIO WEB: Vista principal de autenticación
@@ -58,13 +276,16 @@ def auth_view(request):
     - Presenta formularios de registro e inicio de sesión
     - Interfaz moderna con validación en tiempo real
     - Diseño responsivo para todos los dispositivos
+    - Cacheable en el navegador una hora; `Vary: Cookie` fuerza una copia
+      nueva cuando cambian la sesión, el token CSRF o los mensajes
     """
-    return render(request, 'usuarios/login.html')
+    return _render_login(request)
 
 # ========================================
 # SERVICIO WEB: REGISTRO DE USUARIOS
 # ========================================
 @csrf_exempt
+@require_POST
 def registro_usuario(request):
     """
     SERVICIO WEB: Endpoint para registro de nuevos usuarios
@@ -81,7 +302,7 @@ def registro_usuario(request):
       * password_confirm: Confirmación de contraseña (debe coincidir)
     
     RETORNA:
-    - JsonResponse: Respuesta JSON con el resultado del registro
+    - HttpResponse: Respuesta JSON con el resultado del registro
       * success: Boolean indicando si el registro fue exitoso
       * message: Mensaje descriptivo del resultado
     
@@ -90,90 +311,97 @@ def registro_usuario(request):
     - Validación de coincidencia de contraseñas
     - Verificación de longitud mínima de contraseña
     - Comprobación de email único en el sistema
-    - Generación automática de username único
+    - Generación automática de username único (sufijo aleatorio)
     
     CÓDIGOS DE RESPUESTA:
     - 200: Registro exitoso
     - 400: Error en validación de datos
+    - 405: Método distinto de POST (rechazado por @require_POST)
+    - 413: Cuerpo mayor que MAX_CUERPO_JSON
     """
-    if request.method == 'POST':
-        try:
-            # PASO 1: Extraer datos JSON del request del servicio web
-            data = json.loads(request.body)
-            email = data.get('email')
-            password = data.get('password')
-            password_confirm = data.get('password_confirm')
-            
-            # PASO 2: Validaciones de seguridad del servicio
-            # Verificar que todos los campos obligatorios estén presentes
-            if not email or not password or not password_confirm:
-                return JsonResponse({
-                    'success': False, 
-                    'message': 'Todos los campos son obligatorios'
-                })
-            
-            # Validar que las contraseñas coincidan
-            if password != password_confirm:
-                return JsonResponse({
-                    'success': False, 
-                    'message': 'Las contraseñas no coinciden'
-                })
-            
-            # Validar longitud mínima de contraseña para seguridad
-            if len(password) < 6:
-                return JsonResponse({
-                    'success': False, 
-                    'message': 'La contraseña debe tener al menos 6 caracteres'
-                })
-            
-            # PASO 3: Verificar unicidad del email en la base de datos
-            if Usuario.objects.filter(email=email).exists():
-                return JsonResponse({
-                    'success': False, 
-                    'message': 'Este email ya está registrado'
-                })
-            
-            # PASO 4: Crear el usuario en el sistema
-            # Generar username único basado en el email
-            username = email.split('@')[0]  # Extraer parte local del email
-            contador = 1
-            username_original = username
-            
-            # Asegurar que el username sea único en la base de datos
-            while Usuario.objects.filter(username=username).exists():
-                username = f"{username_original}{contador}"
-                contador += 1
-            
-            # Crear el usuario usando el sistema de autenticación de Django
-            usuario = Usuario.objects.create_user(
-                username=username,
-                email=email,
-                password=password
-            )
-            
-            # PASO 5: Respuesta exitosa del servicio web
-            return JsonResponse({
-                'success': True, 
-                'message': 'Usuario registrado exitosamente'
+    try:
+        # PASO 1: Extraer datos JSON del request del servicio web
+        data = _loads(_leer_cuerpo(request))
+        email = data.get('email')
+        password = data.get('password')
+        password_confirm = data.get('password_confirm')
+        
+        # PASO 2: Validaciones de seguridad del servicio
+        # Verificar que todos los campos obligatorios estén presentes
+        if not email or not password or not password_confirm:
+            return _respuesta_json({
+                'success': False, 
+                'message': 'Todos los campos son obligatorios'
             })
-            
-        except json.JSONDecodeError:
-            return JsonResponse({
+        
+        # Validar que las contraseñas coincidan
+        if password != password_confirm:
+            return _respuesta_json({
                 'success': False, 
-                'message': 'Error en el formato de datos'
+                'message': 'Las contraseñas no coinciden'
             })
-        except Exception as e:
-            return JsonResponse({
+        
+        # Validar longitud mínima de contraseña para seguridad
+        if len(password) < 6:
+            return _respuesta_json({
                 'success': False, 
-                'message': f'Error interno: {str(e)}'
+                'message': 'La contraseña debe tener al menos 6 caracteres'
             })
-    
-    return JsonResponse({'success': False, 'message': 'Método no permitido'})
+        
+        # PASO 3: Generar el username a partir del email con un sufijo
+        # aleatorio, sin sondear la base de datos en busca de colisiones
+        username_base = email.split('@')[0]  # Extraer parte local del email
+        
+        # PASO 4: Un solo INSERT; las restricciones UNIQUE de `email` y
+        # `username` rechazan los duplicados sin consultar antes. La contraseña se
+        # hashea una sola vez, fuera de la transacción y de los reintentos
+        password_hash = make_password(password)
+        for _ in range(2):
+            username = f"{username_base}_{secrets.token_hex(3)}"
+            try:
+                with transaction.atomic():
+                    usuario = _crear_usuario(username, email, password_hash)
+                break
+            except IntegrityError:
+                if Usuario.objects.filter(email=Usuario.objects.normalize_email(email)).exists():
+                    return _respuesta_json({
+                        'success': False, 
+                        'message': 'Este email ya está registrado'
+                    })
+                # Colisión del sufijo aleatorio: se reintenta una vez con otro
+        else:
+            return _respuesta_json({
+                'success': False, 
+                'message': 'No se pudo completar el registro, intenta de nuevo'
+            })
+        
+        # PASO 5: Respuesta exitosa del servicio web
+        return _respuesta_json({
+            'success': True, 
+            'message': 'Usuario registrado exitosamente'
+        })
+        
+    except RequestDataTooBig:
+        return _respuesta_json({
+            'success': False, 
+            'message': 'Error en el formato de datos: cuerpo demasiado grande'
+        }, status=413)
+    except JSONDecodeError:
+        return _respuesta_json({
+            'success': False, 
+            'message': 'Error en el formato de datos'
+        })
+    except Exception as e:
+        return _respuesta_json({
+            'success': False, 
+            'message': f'Error interno: {str(e)}'
+        })
 
 # ========================================
 # SERVICIO WEB: INICIO DE SESIÓN
 # ========================================
 @csrf_exempt
+@require_POST
 def login_usuario(request):
     """
     SERVICIO WEB: Endpoint para autenticación de usuarios
@@ -189,7 +417,7 @@ def login_usuario(request):
       * password: Contraseña del usuario (obligatorio)
     
     RETORNA:
-    - JsonResponse: Respuesta JSON con el resultado de la autenticación
+    - HttpResponse: Respuesta JSON con el resultado de la autenticación
       * success: Boolean indicando si la autenticación fue exitosa
       * message: Mensaje descriptivo del resultado
       * redirect_url: URL de redirección en caso de éxito (opcional)
@@ -205,68 +433,51 @@ def login_usuario(request):
     - 200 + success:true: Autenticación satisfactoria
     - 200 + success:false: Error en la autenticación
     - 400: Error en formato de datos
+    - 429: Demasiados intentos fallidos para la IP y el email
+    - 405: Método distinto de POST (rechazado por @require_POST)
+    - 413: Cuerpo mayor que MAX_CUERPO_JSON
     
     SEGURIDAD:
     - Validación de credenciales con hash seguro
     - Manejo de sesiones HTTP seguras
-    - Protección contra ataques de fuerza bruta
+    - Protección contra ataques de fuerza bruta: tras MAX_INTENTOS_LOGIN fallos
+      en VENTANA_INTENTOS_LOGIN segundos se responde 429 sin ejecutar el hasher
     """
-    if request.method == 'POST':
-        try:
-            # PASO 1: Extraer credenciales del request del servicio web
-            data = json.loads(request.body)
-            email = data.get('email')
-            password = data.get('password')
-            
-            # PASO 2: Validaciones de campos obligatorios
-            if not email or not password:
-                return JsonResponse({
-                    'success': False, 
-                    'message': 'Email y contraseña son obligatorios'
-                })
-            
-            # PASO 3: Proceso de autenticación del servicio web
-            # Verificar credenciales contra la base de datos
-            usuario = authenticate(request, username=email, password=password)
+    try:
+        # PASO 1: Extraer credenciales del request del servicio web
+        email, password = _extraer_credenciales(_leer_cuerpo(request))
+        
+        # PASO 2: Validaciones de campos obligatorios
+        if not email or not password:
+            return _respuesta_cuerpo(_LOGIN_FALTAN_DATOS)
+        
+        # PASO 3: Proceso de autenticación del servicio web
+        # Verificar credenciales, estado de la cuenta e iniciar sesión
+        usuario, motivo = _autenticar(request, email, password)
+        
+        # PASO 4: Evaluar resultado de la autenticación
+        if usuario is not None:
+            # AUTENTICACIÓN SATISFACTORIA
+            return _respuesta_cuerpo(_LOGIN_OK)
+        if motivo == DEMASIADOS_INTENTOS:
+            return _respuesta_cuerpo(_LOGIN_DEMASIADOS_INTENTOS, status=429)
+        if motivo == CUENTA_DESACTIVADA:
+            return _respuesta_cuerpo(_LOGIN_CUENTA_DESACTIVADA)
+        # ERROR EN LA AUTENTICACIÓN: Credenciales incorrectas
+        return _respuesta_cuerpo(_LOGIN_CREDENCIALES_INCORRECTAS)
             
-            # PASO 4: Evaluar resultado de la autenticación
-            if usuario is not None:
-                # Verificar que la cuenta esté activa
-                if usuario.is_active:
-                    # AUTENTICACIÓN SATISFACTORIA - Iniciar sesión
-                    login(request, usuario)
-                    return JsonResponse({
-                        'success': True, 
-                        'message': 'Autenticación satisfactoria - Bienvenido a Huellitas Alegres',
-                        'redirect_url': '/productos/'
-                    })
-                else:
-                    # ERROR: Cuenta desactivada
-                    return JsonResponse({
-                        'success': False, 
-                        'message': 'Error en la autenticación: Cuenta desactivada'
-                    })
-            else:
-                # ERROR EN LA AUTENTICACIÓN: Credenciales incorrectas
-                return JsonResponse({
-                    'success': False, 
-                    'message': 'Error en la autenticación: Email o contraseña incorrectos'
-                })
-                
-        except json.JSONDecodeError:
-            # ERROR: Formato de datos JSON inválido
-            return JsonResponse({
-                'success': False, 
-                'message': 'Error en la autenticación: Formato de datos inválido'
-            })
-        except Exception as e:
-            # ERROR: Excepción interna del servidor
-            return JsonResponse({
-                'success': False, 
-                'message': f'Error en la autenticación: {str(e)}'
-            })
-    
-    return JsonResponse({'success': False, 'message': 'Método no permitido'})
+    except RequestDataTooBig:
+        # ERROR: Cuerpo mayor que MAX_CUERPO_JSON
+        return _respuesta_cuerpo(_LOGIN_FORMATO_INVALIDO, status=413)
+    except JSONDecodeError:
+        # ERROR: Formato de datos JSON inválido
+        return _respuesta_cuerpo(_LOGIN_FORMATO_INVALIDO)
+    except Exception as e:
+        # ERROR: Excepción interna del servidor
+        return _respuesta_json({
+            'success': False, 
+            'message': f'Error en la autenticación: {str(e)}'
+        })
 
 # Vista para cerrar sesión
 @login_required
@@ -277,6 +488,13 @@ def logout_usuario(request):
     return redirect('usuarios:auth')
 
 # Nuevas vistas para formularios HTML
+# Mensajes del formulario de login para cada motivo de fallo de _autenticar
+_MENSAJES_LOGIN_FALLIDO = {
+    DEMASIADOS_INTENTOS: 'Demasiados intentos fallidos, intenta de nuevo en un minuto',
+    CUENTA_DESACTIVADA: 'Tu cuenta está desactivada',
+    CREDENCIALES_INCORRECTAS: 'Email o contraseña incorrectos',
+}
+
 def login_view(request):
     """Vista para mostrar y procesar el formulario de login"""
     if request.method == 'POST':
@@ -285,17 +503,16 @@ def login_view(request):
         
         if email and password:
             # Autenticar directamente con email ya que USERNAME_FIELD = 'email'
-            user = authenticate(request, username=email, password=password)
+            user, motivo = _autenticar(request, email, password)
             if user is not None:
-                login(request, user)
-                messages.success(request, f'¡Bienvenido {user.first_name or user.username}!')
+                # Sin mensaje de bienvenida: la barra de navegación ya saluda al usuario
+                # y así el login no escribe en el almacenamiento de mensajes
                 return redirect('productos:lista')
-            else:
-                messages.error(request, 'Email o contraseña incorrectos')
+            messages.error(request, _MENSAJES_LOGIN_FALLIDO[motivo])
         else:
             messages.error(request, 'Por favor completa todos los campos')
     
-    return render(request, 'usuarios/login.html')
+    return _render_login(request)
 
 def register_view(request):
     """Vista para procesar el registro de usuarios"""
@@ -306,57 +523,61 @@ def register_view(request):
         
         # Validaciones
         if not all([email, password1, password2]):
-            messages.error(request, 'Todos los campos son obligatorios')
-            return render(request, 'usuarios/login.html')
+            return _render_login(request, 'Todos los campos son obligatorios')
         
         if password1 != password2:
-            messages.error(request, 'Las contraseñas no coinciden')
-            return render(request, 'usuarios/login.html')
+            return _render_login(request, 'Las contraseñas no coinciden')
         
         if len(password1) < 6:
-            messages.error(request, 'La contraseña debe tener al menos 6 caracteres')
-            return render(request, 'usuarios/login.html')
-        
-        # Verificar si el email ya existe
-        if Usuario.objects.filter(email=email).exists():
-            messages.error(request, 'Este email ya está registrado')
-            return render(request, 'usuarios/login.html')
+            return _render_login(request, 'La contraseña debe tener al menos 6 caracteres')
         
         try:
             # Crear el usuario usando el modelo personalizado
-            # Generar username único basado en el email
-            username = email.split('@')[0]
-            counter = 1
-            original_username = username
-            while Usuario.objects.filter(username=username).exists():
-                username = f"{original_username}{counter}"
-                counter += 1
-            
-            print(f"DEBUG: Intentando crear usuario con username={username}, email={email}")
+            original_username = email.split('@')[0]
+            # El hasher (lo más costoso del registro) corre fuera de la transacción y del bloqueo
+            password_hash = make_password(password1)
             
-            user = Usuario.objects.create_user(
-                username=username,
-                email=email,
-                password=password1
-            )
-            
-            print(f"DEBUG: Usuario creado exitosamente: {user.id}, {user.username}, {user.email}")
-            
-            # Verificar que el usuario se guardó
-            if Usuario.objects.filter(email=email).exists():
-                print(f"DEBUG: Usuario confirmado en base de datos")
-                messages.success(request, '¡Registro exitoso! Ya puedes iniciar sesión')
+            # La restricción UNIQUE de `email` rechaza los duplicados sin consultar antes
+            for _ in range(2):
+                try:
+                    with transaction.atomic():
+                        # Serializa los registros con el mismo prefijo hasta el COMMIT, así
+                        # dos altas simultáneas no eligen el mismo username
+                        _bloquear_prefijo_username(original_username)
+                    
+                        # Generar username único basado en el email: una sola consulta trae
+                        # los usernames de la forma <prefijo><número> y el sufijo libre se calcula aquí
+                        ocupados = set(
+                            Usuario.objects.filter(username__regex=rf'^{re.escape(original_username)}\d*$')
+                            .values_list('username', flat=True)
+                        )
+                        username = original_username
+                        if username in ocupados:
+                            username = next(
+                                candidato
+                                for candidato in (f"{original_username}{i}" for i in itertools.count(1))
+                                if candidato not in ocupados
+                            )
+                    
+                        logger.debug('Intentando crear usuario con username=%s, email=%s', username, email)
+                    
+                        user = _crear_usuario(username, email, password_hash)
+                    break
+                except IntegrityError:
+                    if Usuario.objects.filter(email=Usuario.objects.normalize_email(email)).exists():
+                        return _render_login(request, 'Este email ya está registrado')
+                    # Colisión del username (p. ej. con una alta fuera del bloqueo): se recalcula una vez
             else:
-                print(f"DEBUG: ERROR - Usuario no encontrado en base de datos después de crear")
-                messages.error(request, 'Error: El usuario no se guardó correctamente')
+                return _render_login(request, 'No se pudo completar el registro, intenta de nuevo')
+            
+            logger.debug('Usuario creado exitosamente: %s, %s, %s', user.id, user.username, user.email)
             
-            return render(request, 'usuarios/login.html')
+            messages.success(request, '¡Registro exitoso! Ya puedes iniciar sesión')
+            return _render_login(request)
             
         except Exception as e:
-            print(f"DEBUG: Error al crear usuario: {str(e)}")
-            import traceback
-            print(f"DEBUG: Traceback completo: {traceback.format_exc()}")
+            logger.exception('Error al crear usuario')
             messages.error(request, f'Error al crear la cuenta: {str(e)}')
-            return render(request, 'usuarios/login.html')
+            return _render_login(request)
     
     return redirect('usuarios:login')